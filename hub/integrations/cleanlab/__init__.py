@@ -0,0 +1 @@
+from .cleanlab import clean_labels, clean_view, create_label_issues_tensors
@@ -0,0 +1,59 @@
+"""
+Single-pass computation of the label issues mask and the label quality scores.
+
+``find_label_issues`` and ``get_label_quality_scores`` each stream through the
+full NxK ``pred_probs`` matrix doing similar per-row work. For the per-row
+filter (``filter_by="predicted_neq_given"``) and the default scoring method
+(``self_confidence``) both outputs come from the same traversal, so fusing
+them halves the memory bandwidth of the post-CV phase. The results are
+bit-exact with the stock cleanlab calls.
+"""
+
+import numpy as np
+
+import numba
+from numba import prange
+
+
+@numba.njit(parallel=True, fastmath=True, cache=True)
+def _scan(labels, pred_probs, eps, issues, scores):
+    num_samples, num_classes = pred_probs.shape
+    for i in prange(num_samples):
+        label = labels[i]
+        given = pred_probs[i, label]
+        # cleanlab grants the given label an epsilon head start before the
+        # argmax, so another class must beat given + eps to flag the row
+        boosted = given + eps
+        best = 0
+        best_prob = boosted if label == 0 else pred_probs[i, 0]
+        for j in range(1, num_classes):
+            prob = boosted if j == label else pred_probs[i, j]
+            if prob > best_prob:
+                best_prob = prob
+                best = j
+        scores[i] = given
+        issues[i] = best != label
+
+
+def fused_issues_and_scores(labels: np.ndarray, pred_probs: np.ndarray):
+    """Computes the label issues mask and the self-confidence quality scores
+    in one traversal of ``pred_probs``.
+
+    Equivalent to ``find_label_issues(..., filter_by="predicted_neq_given")``
+    followed by ``get_label_quality_scores(..., method="self_confidence")``.
+
+    Args:
+        labels (np.ndarray): 1D int64 array with one class label per sample.
+        pred_probs (np.ndarray): Matrix of shape ``(num_samples, num_classes)``
+            with the out-of-fold predicted probabilities.
+
+    Returns:
+        Tuple of the boolean issues mask and the per-sample quality scores.
+    """
+    from hub.integrations.cleanlab.label_issues import _epsilon
+
+    pred_probs = np.asarray(pred_probs)
+    issues = np.empty(len(labels), dtype=np.bool_)
+    scores = np.empty(len(labels), dtype=pred_probs.dtype)
+    _scan(labels, pred_probs, _epsilon(pred_probs.dtype), issues, scores)
+    return issues, scores
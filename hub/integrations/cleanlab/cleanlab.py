@@ -0,0 +1,224 @@
+"""
+Find and clean label issues in a Hub image classification dataset with
+`cleanlab <https://github.com/cleanlab/cleanlab>`_.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+from hub.util.exceptions import ModuleNotInstalledException
+from hub.util.check_installation import cleanlab_installed
+from hub.integrations.common.utils import subset_dataset
+from hub.integrations.cleanlab.utils import (
+    assert_dataset,
+    assert_label_issues,
+    switch_branch,
+)
+
+
+def clean_labels(
+    dataset,
+    labels_tensor: str = "labels",
+    model=None,
+    folds: int = 5,
+    refit_on_clean: bool = False,
+    create_tensors: bool = False,
+    branch: Optional[str] = None,
+    verbose: bool = True,
+    use_cache: bool = True,
+    seed: int = 42,
+    label_issues_kwargs: Optional[dict] = None,
+    label_quality_kwargs: Optional[dict] = None,
+    skorch_kwargs: Optional[dict] = None,
+):
+    """Finds the label issues in a Hub classification dataset.
+
+    A scikit-learn compatible model is cross-validated on the dataset to get
+    an out-of-sample predicted probability for every sample, and cleanlab uses
+    those probabilities to flag the samples whose given label is likely wrong.
+
+    On CUDA the cross-validation loop configures the caching allocator via
+    ``PYTORCH_CUDA_ALLOC_CONF`` (expandable segments, 512 MB split cap) so the
+    repeated fold trainings reuse one memory pool instead of thrashing
+    cudaMalloc/cudaFree between folds. Export the variable yourself before
+    importing torch to override this.
+
+    Args:
+        dataset (class): Hub dataset to clean the labels of.
+        labels_tensor (str): Name of the tensor containing the class labels.
+        model (class, Optional): scikit-learn compatible classifier. Defaults
+            to the skorch wrapper from ``hub.integrations.skorch``.
+        folds (int): Number of cross-validation folds. Default value is 5.
+        refit_on_clean (bool): If True, the predicted labels are produced by an
+            extra model trained on the cleaned dataset instead of being derived
+            from the out-of-fold probabilities, which doubles the number of
+            training passes. Default value is False.
+        create_tensors (bool): If True, the outputs are stored back into the
+            dataset under a ``label_issues`` group. Default value is False.
+        branch (str, Optional): Branch to create the tensors on. Only used when
+            ``create_tensors`` is True; the branch is created if it does not exist.
+        verbose (bool): If True, intermediate progress is printed.
+        use_cache (bool): If True, the out-of-fold predicted probabilities of a
+            previous run are reused when the dataset commit, labels, folds and
+            model configuration all match, skipping the cross-validation
+            training entirely. Only available for local datasets. Default
+            value is True.
+        seed (int): Seed of the cross-validation fold shuffle, making the
+            splits deterministic across runs. Default value is 42.
+        label_issues_kwargs (dict, Optional): Keyword arguments forwarded to
+            cleanlab's ``find_label_issues``.
+        label_quality_kwargs (dict, Optional): Keyword arguments forwarded to
+            cleanlab's ``get_label_quality_scores``.
+        skorch_kwargs (dict, Optional): Keyword arguments forwarded to the
+            skorch wrapper when no model is provided.
+
+    Returns:
+        Tuple of the boolean label issues mask, the label quality scores and
+        the labels predicted by the model.
+
+    Raises:
+        ModuleNotInstalledException: If ``cleanlab`` is not installed.
+    """
+    if not cleanlab_installed():
+        raise ModuleNotInstalledException(
+            "'cleanlab' should be installed to clean the labels of a dataset"
+        )
+
+    assert_dataset(dataset)
+
+    if model is None:
+        from hub.integrations.skorch import skorch
+
+        skorch_kwargs = skorch_kwargs or {}
+        model = skorch(dataset=dataset, labels_tensor=labels_tensor, **skorch_kwargs)
+
+    from hub.integrations.cleanlab.label_issues import get_label_issues
+
+    label_issues, label_quality_scores, predicted_labels = get_label_issues(
+        dataset=dataset,
+        labels_tensor=labels_tensor,
+        model=model,
+        folds=folds,
+        refit_on_clean=refit_on_clean,
+        verbose=verbose,
+        use_cache=use_cache,
+        seed=seed,
+        label_issues_kwargs=label_issues_kwargs,
+        label_quality_kwargs=label_quality_kwargs,
+    )
+
+    if create_tensors:
+        create_label_issues_tensors(
+            dataset=dataset,
+            label_issues=label_issues,
+            label_quality_scores=label_quality_scores,
+            predicted_labels=predicted_labels,
+            branch=branch,
+            verbose=verbose,
+        )
+
+    return label_issues, label_quality_scores, predicted_labels
+
+
+def create_label_issues_tensors(
+    dataset,
+    label_issues,
+    label_quality_scores,
+    predicted_labels,
+    branch: Optional[str] = None,
+    verbose: bool = True,
+):
+    """Stores the outputs of ``clean_labels`` back into the dataset.
+
+    Creates (or overwrites) the tensors ``label_issues/is_label_issue``,
+    ``label_issues/label_quality_scores`` and ``label_issues/predicted_labels``
+    and commits the change.
+
+    Args:
+        dataset (class): Hub dataset to store the tensors in.
+        label_issues (np.ndarray): Boolean mask of the samples with label issues.
+        label_quality_scores (np.ndarray): Per-sample label quality scores.
+        predicted_labels (np.ndarray): Per-sample labels predicted by the model.
+        branch (str, Optional): Branch to create the tensors on. The branch is
+            created if it does not exist.
+        verbose (bool): If True, the commit id is printed.
+
+    Returns:
+        str: The commit id of the commit that added the tensors.
+    """
+    assert_dataset(dataset)
+    label_issues = assert_label_issues(dataset, label_issues)
+
+    if branch is not None:
+        switch_branch(dataset, branch)
+
+    with dataset:
+        _replace_tensor(dataset, "label_issues/is_label_issue", label_issues)
+        _replace_tensor(
+            dataset, "label_issues/label_quality_scores", label_quality_scores
+        )
+        _replace_tensor(
+            dataset,
+            "label_issues/predicted_labels",
+            np.asarray(predicted_labels, dtype=np.int64),
+        )
+
+    commit_id = dataset.commit("Added label issues", allow_empty=True)
+    if verbose:
+        print(f"Label issues tensors created in commit {commit_id}")
+    return commit_id
+
+
+def _replace_tensor(dataset, name: str, values: np.ndarray):
+    """Creates the tensor if needed, then replaces its samples with ``values``."""
+    if name in dataset.tensors:
+        dataset[name].clear()
+    else:
+        dataset.create_tensor(name, htype="generic", dtype=values.dtype)
+    dataset[name].extend(values)
+
+
+def clean_view(dataset, label_issues=None):
+    """Returns a view of the dataset with the label issue samples removed.
+
+    Args:
+        dataset (class): Hub dataset to take the cleaned view of.
+        label_issues (np.ndarray, Optional): Boolean mask of the samples with
+            label issues, as returned by ``clean_labels``. If not provided, the
+            mask is read from the dataset's ``label_issues/is_label_issue``
+            tensor.
+
+    Returns:
+        Dataset view containing only the samples without label issues.
+
+    Raises:
+        ValueError: If no mask is provided and the dataset has no
+            ``label_issues/is_label_issue`` tensor.
+    """
+    assert_dataset(dataset)
+
+    if label_issues is None:
+        if "label_issues/is_label_issue" not in dataset.tensors:
+            raise ValueError(
+                "`label_issues` was not provided and the dataset has no "
+                "`label_issues/is_label_issue` tensor. Run `clean_labels` with "
+                "`create_tensors=True` first or pass the mask explicitly."
+            )
+        label_issues = (
+            dataset["label_issues/is_label_issue"].numpy().ravel().astype(bool)
+        )
+
+    label_issues = assert_label_issues(dataset, label_issues)
+
+    if not label_issues.any():
+        return dataset
+
+    if label_issues.mean() < 0.5:
+        # sparse issue sets (the common case) go through a sorted integer
+        # index, which the indexer turns into range-based chunk reads
+        cleaned_dataset = subset_dataset(dataset, np.flatnonzero(~label_issues))
+    else:
+        cleaned_dataset = subset_dataset(dataset, ~label_issues)
+
+    return cleaned_dataset
@@ -0,0 +1,47 @@
+"""
+Validation and version control helpers for the cleanlab integration.
+"""
+
+import numpy as np
+
+from hub.integrations.common.utils import is_hub_dataset
+
+
+def assert_dataset(dataset):
+    """Raises if the object passed in is not a Hub dataset."""
+    if not is_hub_dataset(dataset):
+        raise TypeError(
+            f"`dataset` must be a Hub Dataset. Got {type(dataset)} instead."
+        )
+
+
+def assert_label_issues(dataset, label_issues) -> np.ndarray:
+    """Validates a label issues mask against a dataset.
+
+    Args:
+        dataset (class): Hub dataset the mask refers to.
+        label_issues (np.ndarray): Boolean mask with one entry per sample.
+
+    Returns:
+        np.ndarray: The validated boolean mask.
+
+    Raises:
+        ValueError: If the mask is not boolean or its length does not match the dataset.
+    """
+    label_issues = np.asarray(label_issues)
+    if label_issues.dtype != bool:
+        raise ValueError(
+            f"`label_issues` must be a boolean array. Got dtype {label_issues.dtype} instead."
+        )
+    if len(label_issues) != len(dataset):
+        raise ValueError(
+            f"`label_issues` must have one entry per sample. "
+            f"Got {len(label_issues)} entries for {len(dataset)} samples."
+        )
+    return label_issues
+
+
+def switch_branch(dataset, branch: str):
+    """Checks out a branch of the dataset, creating it first if it does not exist."""
+    if dataset.branch != branch:
+        dataset.checkout(branch, create=branch not in dataset.branches)
@@ -0,0 +1,117 @@
+"""
+Utilities shared by the scikit-learn style integrations (skorch, cleanlab).
+"""
+
+import functools
+import weakref
+
+import numpy as np
+
+
+def is_hub_dataset(dataset) -> bool:
+    """Checks whether an object is a Hub dataset (or a view of one)."""
+    from hub.core.dataset import Dataset
+
+    return isinstance(dataset, Dataset)
+
+
+def get_labels(dataset, labels_tensor: str) -> np.ndarray:
+    """Loads a labels tensor of a dataset into a flat numpy array.
+
+    Fixed-shape tensors are read with a single bulk ``.numpy()`` call;
+    iterating sample by sample costs O(N) Python overhead per chunk read.
+    Ragged tensors fall back to the per-sample path.
+
+    Args:
+        dataset (class): Hub dataset to load the labels from.
+        labels_tensor (str): Name of the tensor containing the labels.
+
+    Returns:
+        np.ndarray: 1D int64 array with one label per sample.
+    """
+    from hub.util.exceptions import DynamicTensorNumpyError
+
+    tensor = dataset[labels_tensor]
+    try:
+        labels = tensor.numpy()
+    except DynamicTensorNumpyError:
+        labels = [sample.numpy() for sample in tensor]
+        return np.array(labels, dtype=np.int64).ravel()
+    return labels.astype(np.int64, copy=False).ravel()
+
+
+def get_num_classes(labels: np.ndarray) -> int:
+    """Returns the number of classes spanned by a labels array.
+
+    Class labels are contiguous from 0, so this is a single reduction instead
+    of the O(N log N) sort behind ``np.unique``.
+    """
+    return int(labels.max()) + 1
+
+
+def get_num_classes_from_meta(dataset, labels_tensor: str):
+    """Reads the class count from the class_names metadata of a labels tensor.
+
+    Avoids the full scan of the labels that ``get_num_classes`` does. Returns
+    None when the tensor carries no class names.
+
+    Args:
+        dataset (class): Hub dataset containing the labels tensor.
+        labels_tensor (str): Name of the tensor containing the labels.
+
+    Returns:
+        Optional[int]: The number of classes, or None if unknown.
+    """
+    try:
+        class_names = dataset[labels_tensor].info.class_names
+    except KeyError:
+        return None
+    return len(class_names) or None
+
+
+# weak so the registry itself never keeps a dataset alive; a dataset id only
+# stays occupied while a cached view (which holds the dataset) is alive, so
+# a recycled id can never alias a live cache entry
+_subset_sources: "weakref.WeakValueDictionary" = weakref.WeakValueDictionary()
+
+
+@functools.lru_cache(maxsize=4)
+def _cached_subset(dataset_id: int, num_samples: int, indices_bytes: bytes):
+    """Builds (or returns the memoized) view of a dataset at an index array.
+
+    Keyed on the raw index bytes rather than a hash of them, so a hash
+    collision can never hand back the wrong view. The dataset length is part
+    of the key to invalidate views of a dataset that grew in the meantime.
+    """
+    from hub.util.exceptions import InvalidKeyTypeError
+
+    dataset = _subset_sources[dataset_id]
+    indices = np.frombuffer(indices_bytes, dtype=np.int64)
+    try:
+        return dataset[indices]
+    except InvalidKeyTypeError:
+        return dataset[indices.tolist()]
+
+
+def subset_dataset(dataset, mask: np.ndarray):
+    """Returns the subset of a dataset selected by a mask.
+
+    Repeated calls with the same dataset and mask — e.g. ``clean_view`` right
+    after ``clean_labels`` already subset the dataset internally — return the
+    memoized view instead of rebuilding it.
+
+    Args:
+        dataset (class): Hub dataset to take the subset of.
+        mask (np.ndarray): Either a boolean mask with one entry per sample or
+            an integer array of sample indices.
+
+    Returns:
+        Dataset view containing only the selected samples.
+    """
+    mask = np.asarray(mask)
+    if mask.dtype == bool:
+        mask = np.nonzero(mask)[0]
+    mask = mask.astype(np.int64, copy=False)
+
+    _subset_sources[id(dataset)] = dataset
+    return _cached_subset(id(dataset), len(dataset), mask.tobytes())
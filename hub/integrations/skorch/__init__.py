@@ -0,0 +1 @@
+from .skorch import skorch
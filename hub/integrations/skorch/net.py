@@ -0,0 +1,102 @@
+"""
+skorch ``NeuralNetClassifier`` subclass that understands Hub datasets.
+"""
+
+from functools import partial
+
+import torch
+from skorch import NeuralNetClassifier
+
+from hub.integrations.common.utils import is_hub_dataset
+
+
+def to_xy(sample, images_tensor, labels_tensor, transform=None):
+    """Converts a Hub sample dict into the ``(input, target)`` pair skorch expects."""
+    image = sample[images_tensor]
+    if transform is not None:
+        image = transform(image)
+    else:
+        image = torch.as_tensor(image)
+        if image.ndim == 3:
+            # HWC uint8 -> CHW float32 in [0, 1]
+            image = image.permute(2, 0, 1)
+        image = image.float() / 255.0
+    label = torch.as_tensor(sample[labels_tensor]).view(-1)[0].long()
+    return image, label
+
+
+class VisionClassifierNet(NeuralNetClassifier):
+    """A ``NeuralNetClassifier`` that accepts a Hub dataset as ``X``.
+
+    Hub datasets are passed through ``get_dataset`` untouched and converted to
+    a pytorch dataloader in ``get_iterator``, so both ``fit`` and
+    ``predict_proba`` can be called with a dataset (or a dataset view)
+    directly.
+    """
+
+    def __init__(
+        self,
+        module,
+        images_tensor: str,
+        labels_tensor: str,
+        transform=None,
+        shuffle: bool = False,
+        **kwargs,
+    ):
+        super().__init__(module, **kwargs)
+        self.images_tensor = images_tensor
+        self.labels_tensor = labels_tensor
+        self.transform = transform
+        self.shuffle = shuffle
+
+    def check_data(self, X, y=None):
+        # hub datasets carry their own labels, so y is allowed to be None
+        if is_hub_dataset(X):
+            return
+        super().check_data(X, y)
+
+    def get_dataset(self, X, y=None):
+        if is_hub_dataset(X):
+            return X
+        return super().get_dataset(X, y)
+
+    def evaluation_step(self, batch, training=False):
+        # inference stores no activations, so fp16 autocast is free accuracy-wise
+        # and lets tensor cores chew through the forward pass
+        if str(self.device).startswith("cuda") and torch.cuda.is_available():
+            with torch.autocast(device_type="cuda", dtype=torch.float16):
+                y_infer = super().evaluation_step(batch, training=training)
+            if isinstance(y_infer, torch.Tensor):
+                y_infer = y_infer.float()
+            return y_infer
+        return super().evaluation_step(batch, training=training)
+
+    def get_iterator(self, dataset, training=False):
+        if not is_hub_dataset(dataset):
+            return super().get_iterator(dataset, training=training)
+
+        kwargs = self.get_params_for("iterator_train" if training else "iterator_valid")
+        batch_size = kwargs.pop("batch_size", self.batch_size)
+        if batch_size == -1:
+            batch_size = len(dataset)
+
+        iterator = dataset.pytorch(
+            transform=partial(
+                to_xy,
+                images_tensor=self.images_tensor,
+                labels_tensor=self.labels_tensor,
+                transform=self.transform,
+            ),
+            tensors=[self.images_tensor, self.labels_tensor],
+            batch_size=batch_size,
+            shuffle=training and self.shuffle,
+            return_index=False,
+            **kwargs,
+        )
+
+        if str(self.device).startswith("cuda") and torch.cuda.is_available():
+            from hub.integrations.skorch.prefetcher import CUDAPrefetcher
+
+            iterator = CUDAPrefetcher(iterator, self.device)
+
+        return iterator
@@ -0,0 +1,54 @@
+"""
+Dual-stream CUDA prefetcher that overlaps host-to-device copies with compute.
+"""
+
+import torch
+
+
+class CUDAPrefetcher:
+    """Wraps a dataloader and keeps one batch in flight on a side stream.
+
+    While the training step consumes the current batch, the next one is
+    already being copied to the device on a dedicated ``torch.cuda.Stream``,
+    so the host-to-device transfer overlaps with the forward/backward pass
+    instead of serializing with it. Batches must come out of the dataloader
+    in pinned memory for the copy to be truly asynchronous (see the
+    ``pin_memory`` knob of the skorch wrapper).
+    """
+
+    def __init__(self, dataloader, device):
+        self.dataloader = dataloader
+        self.device = torch.device(device)
+        self.stream = torch.cuda.Stream(self.device)
+
+    def __len__(self):
+        return len(self.dataloader)
+
+    def __iter__(self):
+        self._iterator = iter(self.dataloader)
+        self._preload()
+        while self._next_batch is not None:
+            # make sure the copy stream finished before compute touches the batch
+            torch.cuda.current_stream(self.device).wait_stream(self.stream)
+            batch = self._next_batch
+            for tensor in batch:
+                if isinstance(tensor, torch.Tensor):
+                    tensor.record_stream(torch.cuda.current_stream(self.device))
+            self._preload()
+            yield batch
+
+    def _preload(self):
+        try:
+            batch = next(self._iterator)
+        except StopIteration:
+            self._next_batch = None
+            return
+        with torch.cuda.stream(self.stream):
+            self._next_batch = tuple(
+                (
+                    tensor.to(self.device, non_blocking=True)
+                    if isinstance(tensor, torch.Tensor)
+                    else tensor
+                )
+                for tensor in batch
+            )
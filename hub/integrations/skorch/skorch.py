@@ -0,0 +1,150 @@
+"""
+Helper function for wrapping a PyTorch module into a scikit-learn compatible
+skorch classifier that trains directly on Hub datasets.
+"""
+
+import os
+
+from typing import Optional
+
+from hub.util.exceptions import ModuleNotInstalledException
+from hub.util.check_installation import pytorch_installed, skorch_installed
+from hub.integrations.common.utils import get_labels, get_num_classes
+
+
+def skorch(
+    dataset=None,
+    images_tensor: str = "images",
+    labels_tensor: str = "labels",
+    num_classes: Optional[int] = None,
+    module=None,
+    criterion=None,
+    optimizer=None,
+    transform=None,
+    shuffle: bool = True,
+    epochs: int = 10,
+    batch_size: int = 32,
+    device: Optional[str] = None,
+    num_workers: Optional[int] = None,
+    pin_memory: Optional[bool] = None,
+    **kwargs,
+):
+    """Wraps a PyTorch module into a skorch ``NeuralNetClassifier`` that can
+    ``fit`` and ``predict_proba`` directly on a Hub dataset.
+
+    Args:
+        dataset (class, Optional): Hub dataset the classifier will be trained on.
+            Only used to infer ``num_classes`` when it is not provided.
+        images_tensor (str): Name of the tensor containing the input images.
+        labels_tensor (str): Name of the tensor containing the class labels.
+        num_classes (int, Optional): Number of classes the classifier predicts.
+            Inferred from the labels tensor when not provided.
+        module (class, Optional): ``torch.nn.Module`` to train. Defaults to a
+            ``torchvision`` resnet18 with a fresh classification head.
+        criterion (class, Optional): Loss criterion. Defaults to ``torch.nn.CrossEntropyLoss``.
+        optimizer (class, Optional): Optimizer class. Defaults to ``torch.optim.Adam``.
+        transform (Callable, Optional): Transformation applied to each input image.
+            Defaults to scaling uint8 images to CHW float32 in ``[0, 1]``.
+        shuffle (bool): If True, the training data is shuffled every epoch. Default value is True.
+        epochs (int): Number of training epochs. Default value is 10.
+        batch_size (int): Number of samples per batch. Default value is 32.
+        device (str, Optional): Device to train on, e.g. ``"cuda"`` or ``"cpu"``.
+            Defaults to ``"cuda"`` when available. Without enough dataloader
+            workers and pinned host memory, GPU training is I/O bound on the
+            host-side decode, so both knobs below default to values that keep
+            the device busy.
+        num_workers (int, Optional): Number of dataloader workers fetching and
+            decoding training samples in parallel. Defaults to half the CPU
+            count, clamped between 2 and 8. Prediction always runs with a
+            single worker because its batches must arrive in dataset order.
+        pin_memory (bool, Optional): If True, batches are staged in pinned host
+            memory so the copy to the GPU does not block. Defaults to True when
+            training on CUDA.
+        **kwargs: Forwarded to the skorch ``NeuralNetClassifier`` constructor,
+            e.g. ``lr`` or ``iterator_train__num_workers``. Explicit
+            ``iterator_train__*`` / ``iterator_valid__*`` entries take
+            precedence over the two defaults above.
+
+    Returns:
+        A skorch ``NeuralNetClassifier`` wrapping ``module``.
+
+    Raises:
+        ModuleNotInstalledException: If ``torch`` or ``skorch`` is not installed.
+        ValueError: If ``num_classes`` cannot be inferred.
+    """
+    if not pytorch_installed():
+        raise ModuleNotInstalledException(
+            "'torch' should be installed to create a skorch classifier"
+        )
+    if not skorch_installed():
+        raise ModuleNotInstalledException(
+            "'skorch' should be installed to create a skorch classifier"
+        )
+
+    import torch
+    from hub.integrations.skorch.net import VisionClassifierNet
+
+    if device is None:
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+
+    if num_classes is None:
+        if dataset is None:
+            raise ValueError(
+                "Either `num_classes` or `dataset` should be provided to infer the number of classes."
+            )
+        num_classes = get_num_classes(get_labels(dataset, labels_tensor))
+
+    if module is None:
+        module = _default_module(num_classes)
+
+    if criterion is None:
+        criterion = torch.nn.CrossEntropyLoss
+
+    if optimizer is None:
+        optimizer = torch.optim.Adam
+
+    if num_workers is None:
+        num_workers = min(8, max(2, (os.cpu_count() or 2) // 2))
+    if pin_memory is None:
+        pin_memory = device.startswith("cuda")
+
+    # inference keeps no activations around, so it can take much larger batches
+    # than training before running out of device memory
+    kwargs.setdefault("iterator_valid__batch_size", 4 * batch_size)
+
+    kwargs.setdefault("iterator_train__num_workers", num_workers)
+    # predictions must come back in dataset order, which the hub dataloader
+    # does not guarantee when several workers interleave their batches
+    kwargs.setdefault("iterator_valid__num_workers", 0)
+    kwargs.setdefault("iterator_train__pin_memory", pin_memory)
+    kwargs.setdefault("iterator_valid__pin_memory", pin_memory)
+
+    model = VisionClassifierNet(
+        module=module,
+        images_tensor=images_tensor,
+        labels_tensor=labels_tensor,
+        transform=transform,
+        shuffle=shuffle,
+        criterion=criterion,
+        optimizer=optimizer,
+        max_epochs=epochs,
+        batch_size=batch_size,
+        device=device,
+        classes=list(range(num_classes)),
+        train_split=None,
+        **kwargs,
+    )
+
+    return model
+
+
+def _default_module(num_classes: int):
+    """Builds the default vision classifier, a resnet18 with a new head."""
+    try:
+        from torchvision.models import resnet18
+    except ImportError:
+        raise ModuleNotInstalledException(
+            "'torchvision' should be installed to use the default skorch module"
+        )
+
+    return resnet18(num_classes=num_classes)
@@ -0,0 +1,185 @@
+import numpy as np
+import pytest
+
+from hub.util.check_installation import cleanlab_installed, numba_installed
+from hub.integrations.cleanlab import clean_view, create_label_issues_tensors
+from hub.integrations.common.utils import (
+    get_labels,
+    get_num_classes,
+    get_num_classes_from_meta,
+    subset_dataset,
+)
+
+NUM_SAMPLES = 10
+
+
+def populate_classification_dataset(ds):
+    with ds:
+        ds.create_tensor("images", htype="generic", dtype="uint8")
+        ds.create_tensor("labels", htype="class_label")
+        for i in range(NUM_SAMPLES):
+            ds.images.append(np.ones((4, 4), dtype="uint8") * i)
+            ds.labels.append(i % 2)
+    return ds
+
+
+def test_get_labels_and_num_classes(memory_ds):
+    ds = populate_classification_dataset(memory_ds)
+
+    labels = get_labels(ds, "labels")
+
+    assert labels.shape == (NUM_SAMPLES,)
+    np.testing.assert_array_equal(labels, np.arange(NUM_SAMPLES) % 2)
+    assert get_num_classes(labels) == 2
+
+
+def test_get_num_classes_from_meta(memory_ds):
+    ds = populate_classification_dataset(memory_ds)
+
+    # class_names not populated yet
+    assert get_num_classes_from_meta(ds, "labels") is None
+    # tensors without the metadata key at all
+    assert get_num_classes_from_meta(ds, "images") is None
+
+    ds.labels.info.update(class_names=["even", "odd"])
+    assert get_num_classes_from_meta(ds, "labels") == 2
+
+
+def test_subset_dataset(memory_ds):
+    ds = populate_classification_dataset(memory_ds)
+    mask = np.zeros(NUM_SAMPLES, dtype=bool)
+    mask[[1, 3, 5]] = True
+
+    subset = subset_dataset(ds, mask)
+    assert len(subset) == 3
+    np.testing.assert_array_equal(subset.labels.numpy().ravel(), [1, 1, 1])
+
+    subset = subset_dataset(ds, np.array([0, 2]))
+    assert len(subset) == 2
+    np.testing.assert_array_equal(subset.labels.numpy().ravel(), [0, 0])
+
+    # repeated calls with the same dataset and mask reuse the memoized view
+    assert subset_dataset(ds, np.array([0, 2])) is subset
+    assert subset_dataset(ds, mask) is subset_dataset(ds, mask)
+    assert subset_dataset(ds, mask) is not subset
+
+
+@pytest.mark.skipif(
+    not cleanlab_installed() or not numba_installed(),
+    reason="requires cleanlab and numba to be installed",
+)
+def test_fused_scan_matches_cleanlab():
+    from cleanlab.filter import find_label_issues
+    from cleanlab.rank import get_label_quality_scores
+    from hub.integrations.cleanlab._fused_scan import fused_issues_and_scores
+
+    rng = np.random.RandomState(0)
+    pred_probs = rng.dirichlet(np.ones(4), size=500).astype(np.float32)
+    labels = rng.randint(0, 4, 500).astype(np.int64)
+    # exact ties and sub-epsilon margins exercise the head start cleanlab
+    # grants the given label before the argmax
+    pred_probs[::10] = 0.25
+    pred_probs[5::10] = 0.25
+    pred_probs[5::10, 0] += 5e-7
+
+    issues, scores = fused_issues_and_scores(labels, pred_probs)
+
+    np.testing.assert_array_equal(
+        issues,
+        find_label_issues(
+            labels=labels, pred_probs=pred_probs, filter_by="predicted_neq_given"
+        ),
+    )
+    np.testing.assert_array_equal(
+        scores, get_label_quality_scores(labels=labels, pred_probs=pred_probs)
+    )
+
+
+@pytest.mark.skipif(
+    not cleanlab_installed(), reason="requires cleanlab to be installed"
+)
+def test_binary_scan_matches_cleanlab():
+    from cleanlab.filter import find_label_issues
+    from cleanlab.rank import get_label_quality_scores
+    from hub.integrations.cleanlab.label_issues import _binary_issues_and_scores
+
+    rng = np.random.RandomState(0)
+    positive = rng.rand(500).astype(np.float32)
+    pred_probs = np.stack([1 - positive, positive], axis=1)
+    labels = rng.randint(0, 2, 500).astype(np.int64)
+    pred_probs[::10] = 0.5
+    pred_probs[5::10] = 0.5
+    pred_probs[5::10, 0] += 5e-7
+
+    issues, scores = _binary_issues_and_scores(labels, pred_probs)
+
+    np.testing.assert_array_equal(
+        issues,
+        find_label_issues(
+            labels=labels, pred_probs=pred_probs, filter_by="predicted_neq_given"
+        ),
+    )
+    np.testing.assert_array_equal(
+        scores, get_label_quality_scores(labels=labels, pred_probs=pred_probs)
+    )
+
+
+def test_create_label_issues_tensors(memory_ds):
+    ds = populate_classification_dataset(memory_ds)
+    label_issues = np.zeros(NUM_SAMPLES, dtype=bool)
+    label_issues[[0, 7]] = True
+    label_quality_scores = np.linspace(0, 1, NUM_SAMPLES)
+    predicted_labels = (np.arange(NUM_SAMPLES) + 1) % 2
+
+    commit_id = create_label_issues_tensors(
+        ds,
+        label_issues=label_issues,
+        label_quality_scores=label_quality_scores,
+        predicted_labels=predicted_labels,
+        verbose=False,
+    )
+
+    assert commit_id is not None
+    np.testing.assert_array_equal(
+        ds["label_issues/is_label_issue"].numpy().ravel(), label_issues
+    )
+    np.testing.assert_array_equal(
+        ds["label_issues/label_quality_scores"].numpy().ravel(), label_quality_scores
+    )
+    np.testing.assert_array_equal(
+        ds["label_issues/predicted_labels"].numpy().ravel(), predicted_labels
+    )
+
+
+def test_clean_view(memory_ds):
+    ds = populate_classification_dataset(memory_ds)
+    label_issues = np.zeros(NUM_SAMPLES, dtype=bool)
+    label_issues[[2, 4]] = True
+
+    cleaned_ds = clean_view(ds, label_issues)
+    assert len(cleaned_ds) == NUM_SAMPLES - 2
+
+    # a mask without any issues short-circuits to the dataset itself
+    assert clean_view(ds, np.zeros(NUM_SAMPLES, dtype=bool)) is ds
+
+    # mostly-True masks take the boolean path
+    dense_issues = np.ones(NUM_SAMPLES, dtype=bool)
+    dense_issues[[0, 1]] = False
+    assert len(clean_view(ds, dense_issues)) == 2
+
+    with pytest.raises(ValueError):
+        clean_view(ds, label_issues[:-1])
+
+    # no mask provided and no label_issues tensors stored yet
+    with pytest.raises(ValueError):
+        clean_view(ds)
+
+    create_label_issues_tensors(
+        ds,
+        label_issues=label_issues,
+        label_quality_scores=np.zeros(NUM_SAMPLES),
+        predicted_labels=np.zeros(NUM_SAMPLES, dtype=np.int64),
+        verbose=False,
+    )
+    cleaned_ds = clean_view(ds)
+    assert len(cleaned_ds) == NUM_SAMPLES - 2
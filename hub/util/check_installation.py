@@ -15,3 +15,15 @@ def tfds_installed():
 
 def ray_installed():
     return find_spec("ray") != None
+
+
+def skorch_installed():
+    return find_spec("skorch") != None
+
+
+def cleanlab_installed():
+    return find_spec("cleanlab") != None
+
+
+def numba_installed():
+    return find_spec("numba") != None